@@ -5,11 +5,12 @@ Git Monitor Module for Developer Intervention MCP
 """
 
 import os
+import bisect
 import subprocess
 import json
 import time
 import threading
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 from pathlib import Path
@@ -17,7 +18,15 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# 事件类型 -> 活动摘要统计字段
+EVENT_TYPE_STAT_KEYS = {
+    "committed": "commits",
+    "file_modified": "file_modifications",
+    "staged": "files_staged",
+    "pushed": "pushes"
+}
+
+@dataclass(slots=True)
 class GitStatus:
     """Git状态数据模型"""
     repository_path: str
@@ -32,7 +41,7 @@ class GitStatus:
     ahead_commits: int
     behind_commits: int
 
-@dataclass
+@dataclass(slots=True)
 class CheckinEvent:
     """Checkin事件数据模型"""
     event_id: str
@@ -53,11 +62,18 @@ class GitMonitor:
         self.monitor_thread = None
         self.last_status = None
         self.checkin_events = []
+        # 与checkin_events一一对应的时间戳（epoch秒，按时间升序），用于二分定位时间窗口
+        self._event_times: List[float] = []
+        self._events_lock = threading.Lock()
+        self._events_version = 0
+        # 活动摘要缓存（只保留最近一次查询）: (hours, 生成时间, 事件版本, 活动统计, 最近事件)
+        self._summary_cache: Optional[tuple] = None
         self.callbacks = []
         
         # 监控配置
         self.monitor_interval = 5  # 秒
         self.max_events_history = 100
+        self.summary_cache_ttl = 5  # 秒
         
         logger.info(f"🔍 Git监控器初始化: {repository_path}")
     
@@ -149,8 +165,8 @@ class GitMonitor:
                 # 检测状态变更
                 if self.last_status:
                     events = self._detect_changes(self.last_status, current_status)
-                    for event in events:
-                        self._handle_checkin_event(event)
+                    if events:
+                        self._handle_checkin_events(events)
                 
                 self.last_status = current_status
                 
@@ -274,11 +290,12 @@ class GitMonitor:
         """检测Git状态变更"""
         events = []
         event_time = datetime.now()
+        event_suffix = int(event_time.timestamp())
         
         # 检测新的提交
         if old_status.last_commit_hash != new_status.last_commit_hash:
             event = CheckinEvent(
-                event_id=f"commit_{int(time.time())}",
+                event_id=f"commit_{event_suffix}",
                 developer_id="current_user",  # 可以从Git配置获取
                 event_type="committed",
                 timestamp=event_time,
@@ -293,7 +310,7 @@ class GitMonitor:
         new_modified = set(new_status.uncommitted_changes) - set(old_status.uncommitted_changes)
         if new_modified:
             event = CheckinEvent(
-                event_id=f"modified_{int(time.time())}",
+                event_id=f"modified_{event_suffix}",
                 developer_id="current_user",
                 event_type="file_modified",
                 timestamp=event_time,
@@ -306,7 +323,7 @@ class GitMonitor:
         new_staged = set(new_status.staged_files) - set(old_status.staged_files)
         if new_staged:
             event = CheckinEvent(
-                event_id=f"staged_{int(time.time())}",
+                event_id=f"staged_{event_suffix}",
                 developer_id="current_user",
                 event_type="staged",
                 timestamp=event_time,
@@ -318,7 +335,7 @@ class GitMonitor:
         # 检测推送 (通过ahead_commits变化检测)
         if old_status.ahead_commits > new_status.ahead_commits:
             event = CheckinEvent(
-                event_id=f"pushed_{int(time.time())}",
+                event_id=f"pushed_{event_suffix}",
                 developer_id="current_user",
                 event_type="pushed",
                 timestamp=event_time,
@@ -330,51 +347,74 @@ class GitMonitor:
         
         return events
     
-    def _handle_checkin_event(self, event: CheckinEvent):
-        """处理checkin事件"""
-        # 添加到事件历史
-        self.checkin_events.append(event)
-        
-        # 保持事件历史大小限制
-        if len(self.checkin_events) > self.max_events_history:
-            self.checkin_events = self.checkin_events[-self.max_events_history:]
+    def _handle_checkin_events(self, events: List[CheckinEvent]):
+        """批量处理checkin事件（一次加锁、一次裁剪）"""
+        with self._events_lock:
+            # 添加到事件历史
+            self.checkin_events.extend(events)
+            self._event_times.extend(event.timestamp.timestamp() for event in events)
+            
+            # 保持事件历史大小限制
+            if len(self.checkin_events) > self.max_events_history:
+                self.checkin_events = self.checkin_events[-self.max_events_history:]
+                self._event_times = self._event_times[-self.max_events_history:]
+            
+            self._events_version += 1
         
-        logger.info(f"📝 Checkin事件: {event.event_type} - {event.files_affected}")
+        for event in events:
+            logger.info(f"📝 Checkin事件: {event.event_type} - {event.files_affected}")
     
     def get_developer_activity_summary(self, hours: int = 24) -> Dict[str, Any]:
         """获取开发者活动摘要"""
         try:
-            cutoff_time = datetime.now() - timedelta(hours=hours)
-            recent_events = [
-                event for event in self.checkin_events 
-                if event.timestamp > cutoff_time
-            ]
+            # 短时间内重复轮询且没有新事件时直接返回缓存结果
+            now_mono = time.monotonic()
+            cached = self._summary_cache
+            if (cached and cached[0] == hours and cached[2] == self._events_version
+                    and now_mono - cached[1] < self.summary_cache_ttl):
+                return self._build_activity_result(cached[3], cached[4])
+            
+            cutoff_time = time.time() - hours * 3600
+            
+            # 事件按时间顺序追加，二分查找窗口起点即可，无需遍历全部历史
+            with self._events_lock:
+                version = self._events_version
+                start = bisect.bisect_right(self._event_times, cutoff_time)
+                recent_events = self.checkin_events[start:]
+            
+            # 统计活动（单次遍历完成分类计数和文件去重）
+            type_counts = dict.fromkeys(EVENT_TYPE_STAT_KEYS.values(), 0)
+            unique_files = set()
+            for event in recent_events:
+                stat_key = EVENT_TYPE_STAT_KEYS.get(event.event_type)
+                if stat_key:
+                    type_counts[stat_key] += 1
+                unique_files.update(event.files_affected)
             
-            # 统计活动
             activity_stats = {
                 "total_events": len(recent_events),
-                "commits": len([e for e in recent_events if e.event_type == "committed"]),
-                "file_modifications": len([e for e in recent_events if e.event_type == "file_modified"]),
-                "files_staged": len([e for e in recent_events if e.event_type == "staged"]),
-                "pushes": len([e for e in recent_events if e.event_type == "pushed"]),
-                "unique_files": len(set(
-                    file_path 
-                    for event in recent_events 
-                    for file_path in event.files_affected
-                )),
+                **type_counts,
+                "unique_files": len(unique_files),
                 "time_period_hours": hours,
                 "last_activity": recent_events[-1].timestamp.isoformat() if recent_events else None
             }
             
-            return {
-                "success": True,
-                "activity_summary": activity_stats,
-                "recent_events": [asdict(event) for event in recent_events[-10:]]  # 最近10个事件
-            }
+            latest_events = tuple(asdict(event) for event in recent_events[-10:])  # 最近10个事件
+            self._summary_cache = (hours, now_mono, version, activity_stats, latest_events)
+            return self._build_activity_result(activity_stats, latest_events)
             
         except Exception as e:
             logger.error(f"❌ 获取活动摘要失败: {e}")
             return {"success": False, "error": str(e)}
+    
+    @staticmethod
+    def _build_activity_result(activity_stats: Dict[str, Any], latest_events: tuple) -> Dict[str, Any]:
+        """由缓存数据构造活动摘要（复制可变容器，调用方修改结果不会影响缓存）"""
+        return {
+            "success": True,
+            "activity_summary": dict(activity_stats),
+            "recent_events": [{**event, "files_affected": list(event["files_affected"])} for event in latest_events]
+        }
 
 # 集成到Developer Intervention MCP的扩展
 class DeveloperInterventionMCPExtension:
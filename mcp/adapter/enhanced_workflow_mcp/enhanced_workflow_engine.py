@@ -15,10 +15,11 @@ import uuid
 from datetime import datetime
 from enum import Enum
 from typing import Dict, Any, List, Optional, Union
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from pathlib import Path
 import sys
 import os
+import threading
 
 # 添加项目路径
 sys.path.append(str(Path(__file__).parent.parent.parent))
@@ -706,11 +707,15 @@ class EnhancedWorkflowEngine(BaseMCP):
 
 # 单例模式实现
 _instance = None
+_instance_lock = threading.Lock()
 
 def get_instance(config: Dict[str, Any] = None):
     """获取EnhancedWorkflowEngine单例实例"""
     global _instance
+    # 快速路径无锁；首次创建时加锁并二次检查，避免并发下重复构造
     if _instance is None:
-        _instance = EnhancedWorkflowEngine(config)
+        with _instance_lock:
+            if _instance is None:
+                _instance = EnhancedWorkflowEngine(config)
     return _instance
 
@@ -289,8 +289,7 @@ class IntelligentDependencyManager:
                 edge.target,
                 DependencyType.CONTROL,  # 默认为控制依赖
                 condition=edge.condition,
-                data_mapping=edge.data_mapping,
-                metadata={"edge_type": edge.type}
+                data_mapping=edge.data_mapping
             )
         
         # 分析隐式依赖关系
@@ -23,6 +23,13 @@ from collections import defaultdict, deque
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 瓶颈类型 -> 优化建议
+BOTTLENECK_RECOMMENDATIONS = {
+    "resource_bottleneck": "考虑增加计算资源或优化资源使用",
+    "dependency_bottleneck": "考虑重构工作流以减少关键路径依赖",
+    "time_bottleneck": "考虑拆分长时间运行的任务或增加并行度",
+}
+
 class SchedulingStrategy(Enum):
     """调度策略"""
     FIFO = "fifo"  # 先进先出
@@ -501,19 +508,17 @@ class ParallelExecutionScheduler:
         recommendations = []
         
         for bottleneck in bottlenecks:
-            if bottleneck.startswith("resource_bottleneck"):
-                recommendations.append("考虑增加计算资源或优化资源使用")
-            elif bottleneck.startswith("dependency_bottleneck"):
-                recommendations.append("考虑重构工作流以减少关键路径依赖")
-            elif bottleneck.startswith("time_bottleneck"):
-                recommendations.append("考虑拆分长时间运行的任务或增加并行度")
+            # 瓶颈标识格式为 "<类型>:<节点ID>"
+            recommendation = BOTTLENECK_RECOMMENDATIONS.get(bottleneck.partition(":")[0])
+            if recommendation:
+                recommendations.append(recommendation)
         
         # 通用建议
         if len(workflow.nodes) > 10:
             recommendations.append("考虑将大型工作流拆分为多个子工作流")
         
-        parallel_nodes = [node for node in workflow.nodes if node.can_parallel]
-        if len(parallel_nodes) < len(workflow.nodes) * 0.5:
+        parallel_count = sum(1 for node in workflow.nodes if node.can_parallel)
+        if parallel_count < len(workflow.nodes) * 0.5:
             recommendations.append("考虑增加更多节点的并行执行能力")
         
         return recommendations
@@ -54,26 +54,28 @@ class PerformanceTest:
                 print(f"❌ 工作流{i}生成失败: {e}")
         
         if times:
-            avg_time = statistics.mean(times)
+            total_time = sum(times)
+            avg_time = total_time / len(times)
             min_time = min(times)
             max_time = max(times)
             median_time = statistics.median(times)
+            success_rate = successful / count * 100
             
             self.results['workflow_generation'] = {
                 'count': count,
                 'successful': successful,
-                'success_rate': successful / count * 100,
+                'success_rate': success_rate,
                 'avg_time': avg_time,
                 'min_time': min_time,
                 'max_time': max_time,
                 'median_time': median_time,
-                'total_time': sum(times)
+                'total_time': total_time
             }
             
             print(f"✅ 工作流生成性能测试完成:")
             print(f"   总数量: {count}")
             print(f"   成功数: {successful}")
-            print(f"   成功率: {successful/count*100:.1f}%")
+            print(f"   成功率: {success_rate:.1f}%")
             print(f"   平均时间: {avg_time:.4f}秒")
             print(f"   最小时间: {min_time:.4f}秒")
             print(f"   最大时间: {max_time:.4f}秒")
@@ -113,21 +115,24 @@ class PerformanceTest:
         cycle_end = time.time()
         
         end_time = time.time()
+        total_time = end_time - start_time
+        topo_sort_time = topo_end - topo_start
+        cycle_detection_time = cycle_end - cycle_start
         
         self.results['dependency_analysis'] = {
             'node_count': node_count,
-            'total_time': end_time - start_time,
-            'topo_sort_time': topo_end - topo_start,
-            'cycle_detection_time': cycle_end - cycle_start,
+            'total_time': total_time,
+            'topo_sort_time': topo_sort_time,
+            'cycle_detection_time': cycle_detection_time,
             'sorted_nodes_count': len(sorted_nodes),
             'has_cycle': has_cycle
         }
         
         print(f"✅ 依赖分析性能测试完成:")
         print(f"   节点数量: {node_count}")
-        print(f"   总时间: {end_time - start_time:.4f}秒")
-        print(f"   拓扑排序: {topo_end - topo_start:.4f}秒")
-        print(f"   循环检测: {cycle_end - cycle_start:.4f}秒")
+        print(f"   总时间: {total_time:.4f}秒")
+        print(f"   拓扑排序: {topo_sort_time:.4f}秒")
+        print(f"   循环检测: {cycle_detection_time:.4f}秒")
         print(f"   排序结果: {len(sorted_nodes)}个节点")
     
     async def test_parallel_execution_performance(self, task_count: int = 20):
@@ -160,13 +165,14 @@ class PerformanceTest:
         parallel_time = parallel_end - parallel_start
         
         speedup = sequential_time / parallel_time if parallel_time > 0 else 0
+        efficiency = speedup / task_count * 100
         
         self.results['parallel_execution'] = {
             'task_count': task_count,
             'sequential_time': sequential_time,
             'parallel_time': parallel_time,
             'speedup': speedup,
-            'efficiency': speedup / task_count * 100
+            'efficiency': efficiency
         }
         
         print(f"✅ 并行执行性能测试完成:")
@@ -174,7 +180,7 @@ class PerformanceTest:
         print(f"   顺序执行: {sequential_time:.4f}秒")
         print(f"   并行执行: {parallel_time:.4f}秒")
         print(f"   加速比: {speedup:.2f}x")
-        print(f"   效率: {speedup/task_count*100:.1f}%")
+        print(f"   效率: {efficiency:.1f}%")
     
     async def test_state_management_performance(self, operation_count: int = 1000):
         """测试状态管理性能"""
@@ -195,6 +201,7 @@ class PerformanceTest:
             'data': {'test': 'data'}
         })
         save_end = time.time()
+        save_time = save_end - save_start
         
         # 批量更新测试
         update_times = []
@@ -213,20 +220,21 @@ class PerformanceTest:
             state = self.state_manager.get_workflow_state(workflow.id)
         query_end = time.time()
         
-        avg_update_time = statistics.mean(update_times) if update_times else 0
+        total_update_time = sum(update_times)
+        avg_update_time = total_update_time / len(update_times) if update_times else 0
         avg_query_time = (query_end - query_start) / 100
         
         self.results['state_management'] = {
             'operation_count': operation_count,
-            'save_time': save_end - save_start,
+            'save_time': save_time,
             'avg_update_time': avg_update_time,
             'avg_query_time': avg_query_time,
-            'total_update_time': sum(update_times)
+            'total_update_time': total_update_time
         }
         
         print(f"✅ 状态管理性能测试完成:")
         print(f"   操作数量: {operation_count}")
-        print(f"   保存时间: {save_end - save_start:.4f}秒")
+        print(f"   保存时间: {save_time:.4f}秒")
         print(f"   平均更新: {avg_update_time:.6f}秒")
         print(f"   平均查询: {avg_query_time:.6f}秒")
     
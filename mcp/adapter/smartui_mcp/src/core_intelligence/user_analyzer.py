@@ -13,6 +13,7 @@ from typing import Dict, List, Any, Optional, Tuple, Set
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
+from itertools import islice
 import re
 import hashlib
 import numpy as np
@@ -938,7 +939,7 @@ class SmartUIUserAnalyzer(IUserAnalyzer):
             user_profile = await self.get_user_profile(user_action.user_id or user_action.session_id)
             
             # 检测意图
-            recent_actions = list(self.action_history[user_action.user_id or user_action.session_id])[-10:]
+            recent_actions = self._get_recent_actions(user_action.user_id or user_action.session_id, 10)
             intents = self.intent_detector.detect_intent(recent_actions, interaction_data.get("context", {}))
             
             # 更新用户画像中的意图
@@ -1069,7 +1070,7 @@ class SmartUIUserAnalyzer(IUserAnalyzer):
                 return {"success": False, "error": "Missing user_id or session_id"}
             
             # 获取最近的行为历史
-            recent_actions = list(self.action_history[user_id])[-20:]
+            recent_actions = self._get_recent_actions(user_id, 20)
             
             # 检测意图
             intents = self.intent_detector.detect_intent(
@@ -1231,6 +1232,16 @@ class SmartUIUserAnalyzer(IUserAnalyzer):
         
         return cleanup_stats
     
+    def _get_recent_actions(self, user_id: str, limit: int) -> List[UserAction]:
+        """获取最近的行为记录（按时间顺序）"""
+        # 从deque尾部反向读取limit条，避免复制整个历史（最多10000条）
+        history = self.action_history.get(user_id)
+        if not history:
+            return []
+        recent = list(islice(reversed(history), limit))
+        recent.reverse()
+        return recent
+    
     async def get_analytics_summary(self) -> Dict[str, Any]:
         """获取分析摘要"""
         return {
@@ -1239,7 +1250,7 @@ class SmartUIUserAnalyzer(IUserAnalyzer):
                 s for s in self.session_manager.sessions.values()
                 if s.get("is_active", False)
             ]),
-            "total_actions": sum(len(actions) for actions in self.action_history.values()),
+            "total_actions": sum(map(len, self.action_history.values())),
             "cache_hit_rate": getattr(self.analysis_cache, "hit_rate", 0.0),
             "last_cleanup": datetime.now().isoformat()
         }
@@ -5,23 +5,87 @@
 """
 
 import asyncio
+import bisect
+import functools
 import json
 import time
 import requests
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, TYPE_CHECKING
 from dataclasses import dataclass
 import sys
 import os
 
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+if TYPE_CHECKING:
+    from version_config_manager import VersionConfigManager
+
 # 添加项目路径
 sys.path.append('/home/ubuntu/kilocode_integrated_repo')
-from version_config_manager import VersionConfigManager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("workflow_test_validator")
 
-@dataclass
+@functools.lru_cache(maxsize=1)
+def get_version_manager() -> "VersionConfigManager":
+    """获取共享的版本配置管理器（首次调用时才导入并初始化）"""
+    from version_config_manager import VersionConfigManager
+    return VersionConfigManager()
+
+def timed_test(error_context: Optional[Callable[[Any], Dict[str, Any]]] = None):
+    """
+    测试方法装饰器：统一计时与异常处理
+    
+    Args:
+        error_context: 出错时附加到结果中的上下文信息（接收validator实例）
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs) -> Dict[str, Any]:
+            start_time = time.perf_counter()
+            try:
+                result = await func(self, *args, **kwargs)
+                result.setdefault("execution_time", time.perf_counter() - start_time)
+                return result
+            except Exception as e:
+                result = {
+                    "status": "error",
+                    "execution_time": time.perf_counter() - start_time,
+                    "error_message": str(e)
+                }
+                if error_context:
+                    result.update(error_context(self))
+                return result
+        return wrapper
+    return decorator
+
+# 总体状态分级：成功率阈值（升序）与对应等级
+OVERALL_STATUS_THRESHOLDS = (0.6, 0.8, 0.9)
+OVERALL_STATUS_LEVELS = ("needs_improvement", "acceptable", "good", "excellent")
+
+# 用户旅程：从官网发现到体验使用的完整流程
+USER_JOURNEY_STEPS = (
+    "访问PowerAuto.ai官网",
+    "发现OCR Enterprise版产品",
+    "点击体验链接",
+    "上传测试图片",
+    "获得OCR结果",
+    "查看处理报告"
+)
+
+# 错误处理测试使用的无效请求（只读，直接作为请求体发送）
+INVALID_WORKFLOW_REQUEST = {
+    "request_id": "invalid_test",
+    "workflow_type": "invalid_workflow",
+    "input_data": {}
+}
+
+@dataclass(slots=True, frozen=True)
 class TestResult:
     """测试结果数据结构"""
     test_id: str
@@ -38,7 +102,10 @@ class WorkflowTestValidator:
         self.coordinator_url = "http://localhost:8096"
         self.powerauto_website = "http://13.221.114.166/"
         self.experience_platform = "http://98.81.255.168:5001/"
-        self.version_manager = VersionConfigManager()
+        self.version_manager = get_version_manager()
+        
+        # 工作流执行接口的固定URL预先绑定
+        self._post_workflow = functools.partial(self._http_post, f"{self.coordinator_url}/workflow/execute")
         
         # 测试用例配置
         self.test_cases = {
@@ -62,9 +129,13 @@ class WorkflowTestValidator:
         """运行综合测试"""
         logger.info("开始运行产品工作流综合测试")
         
+        # 墙上时间只取一次用于标识；耗时统一用单调时钟计算
+        start_wall = time.time()
+        start_mono = time.perf_counter()
+        
         test_results = {
-            "test_session_id": f"test_{int(time.time())}",
-            "start_time": time.time(),
+            "test_session_id": f"test_{int(start_wall)}",
+            "start_time": start_wall,
             "coordinator_health": await self.test_coordinator_health(),
             "version_tests": {},
             "integration_tests": {},
@@ -77,32 +148,43 @@ class WorkflowTestValidator:
             logger.error("协调器健康检查失败，终止测试")
             return test_results
         
-        # 2. 测试三种版本配置
-        for version in ["enterprise", "personal", "opensource"]:
-            test_results["version_tests"][version] = await self.test_version_configuration(version)
-        
-        # 3. 测试两个核心测试用例
-        test_results["integration_tests"]["website_publishing"] = await self.test_website_publishing_workflow()
-        test_results["integration_tests"]["ocr_experience"] = await self.test_ocr_experience_workflow()
-        
-        # 4. 性能测试
+        # 2-3. 版本配置、核心测试用例和端到端测试互不依赖，并发执行
+        versions = ["enterprise", "personal", "opensource"]
+        website_result, ocr_result, e2e_results, *version_results = await asyncio.gather(
+            self.test_website_publishing_workflow(),
+            self.test_ocr_experience_workflow(),
+            self.test_end_to_end_scenarios(),
+            *(self.test_version_configuration(version) for version in versions)
+        )
+        
+        test_results["version_tests"] = dict(zip(versions, version_results))
+        test_results["integration_tests"]["website_publishing"] = website_result
+        test_results["integration_tests"]["ocr_experience"] = ocr_result
+        test_results["end_to_end_tests"] = e2e_results
+        
+        # 4. 性能测试（单独执行，避免并发请求影响响应时间测量）
         test_results["performance_tests"] = await self.test_performance()
         
-        # 5. 端到端测试
-        test_results["end_to_end_tests"] = await self.test_end_to_end_scenarios()
-        
-        test_results["total_time"] = time.time() - test_results["start_time"]
+        test_results["total_time"] = time.perf_counter() - start_mono
         test_results["overall_status"] = self.calculate_overall_status(test_results)
         
         logger.info(f"产品工作流综合测试完成，总耗时: {test_results['total_time']:.2f}秒")
         return test_results
     
+    async def _http_get(self, url: str, **kwargs) -> requests.Response:
+        """在线程中执行阻塞的GET请求，避免阻塞事件循环"""
+        return await asyncio.to_thread(requests.get, url, **kwargs)
+    
+    async def _http_post(self, url: str, **kwargs) -> requests.Response:
+        """在线程中执行阻塞的POST请求，避免阻塞事件循环"""
+        return await asyncio.to_thread(requests.post, url, **kwargs)
+    
     async def test_coordinator_health(self) -> Dict[str, Any]:
         """测试协调器健康状态"""
         logger.info("测试协调器健康状态")
         
         try:
-            response = requests.get(f"{self.coordinator_url}/health", timeout=10)
+            response = await self._http_get(f"{self.coordinator_url}/health", timeout=10)
             if response.status_code == 200:
                 health_data = response.json()
                 return {
@@ -124,193 +206,145 @@ class WorkflowTestValidator:
                 "message": "无法连接到协调器服务"
             }
     
+    @timed_test()
     async def test_version_configuration(self, version: str) -> Dict[str, Any]:
         """测试版本配置"""
         logger.info(f"测试{version}版本配置")
         
-        start_time = time.time()
+        # 获取版本配置
+        config = self.version_manager.get_version_config(version)
+        enabled_agents = self.version_manager.get_enabled_agents(version)
         
-        try:
-            # 获取版本配置
-            config = self.version_manager.get_version_config(version)
-            enabled_agents = self.version_manager.get_enabled_agents(version)
-            
-            # 验证配置完整性
-            config_validation = {
-                "version_exists": True,
-                "agents_configured": len(enabled_agents) > 0,
-                "endpoints_valid": all(agent.mcp_endpoint for agent in enabled_agents),
-                "quality_thresholds_set": all(agent.quality_threshold > 0 for agent in enabled_agents)
-            }
-            
-            # 测试版本限制验证
-            test_request = {
-                "concurrent_workflows": 1,
-                "monthly_usage": 10
-            }
-            limit_validation = self.version_manager.validate_version_limits(version, test_request)
-            
-            execution_time = time.time() - start_time
-            
-            return {
-                "status": "passed" if all(config_validation.values()) else "failed",
-                "execution_time": execution_time,
-                "config_validation": config_validation,
-                "limit_validation": limit_validation,
-                "agent_count": len(enabled_agents),
-                "enabled_agents": [agent.agent_id for agent in enabled_agents],
-                "version_info": {
-                    "display_name": config.display_name,
-                    "target_audience": config.target_audience,
-                    "pricing_tier": config.pricing_tier
-                }
-            }
-            
-        except Exception as e:
-            return {
-                "status": "error",
-                "execution_time": time.time() - start_time,
-                "error_message": str(e)
+        # 验证配置完整性
+        config_validation = {
+            "version_exists": True,
+            "agents_configured": len(enabled_agents) > 0,
+            "endpoints_valid": all(agent.mcp_endpoint for agent in enabled_agents),
+            "quality_thresholds_set": all(agent.quality_threshold > 0 for agent in enabled_agents)
+        }
+        
+        # 测试版本限制验证
+        test_request = {
+            "concurrent_workflows": 1,
+            "monthly_usage": 10
+        }
+        limit_validation = self.version_manager.validate_version_limits(version, test_request)
+        
+        return {
+            "status": "passed" if all(config_validation.values()) else "failed",
+            "config_validation": config_validation,
+            "limit_validation": limit_validation,
+            "agent_count": len(enabled_agents),
+            "enabled_agents": [agent.agent_id for agent in enabled_agents],
+            "version_info": {
+                "display_name": config.display_name,
+                "target_audience": config.target_audience,
+                "pricing_tier": config.pricing_tier
             }
+        }
     
+    @timed_test(error_context=lambda self: {"target_url": self.powerauto_website})
     async def test_website_publishing_workflow(self) -> Dict[str, Any]:
         """测试官网发布工作流"""
         logger.info("测试PowerAuto.ai官网发布工作流")
         
-        start_time = time.time()
+        # 准备测试数据
+        test_data = {
+            "request_id": f"website_test_{int(time.time())}",
+            "user_session": "test_session",
+            "workflow_type": "website_publishing",
+            "input_data": {
+                "product_name": "OCR Enterprise版",
+                "features": ["六大智能体", "繁体中文优化", "高准确度"],
+                "target_audience": "企业用户",
+                "version": "enterprise"
+            },
+            "target_environment": self.powerauto_website,
+            "quality_requirements": {"min_quality_score": 0.85}
+        }
         
-        try:
-            # 准备测试数据
-            test_data = {
-                "request_id": f"website_test_{int(time.time())}",
-                "user_session": "test_session",
-                "workflow_type": "website_publishing",
-                "input_data": {
-                    "product_name": "OCR Enterprise版",
-                    "features": ["六大智能体", "繁体中文优化", "高准确度"],
-                    "target_audience": "企业用户",
-                    "version": "enterprise"
-                },
-                "target_environment": self.powerauto_website,
-                "quality_requirements": {"min_quality_score": 0.85}
-            }
-            
-            # 调用工作流执行API
-            response = requests.post(
-                f"{self.coordinator_url}/workflow/execute",
-                json=test_data,
-                timeout=60
-            )
+        # 调用工作流执行API
+        response = await self._post_workflow(json=test_data, timeout=60)
+        
+        if response.status_code == 200:
+            result_data = response.json()
             
-            execution_time = time.time() - start_time
+            # 验证结果
+            validation = {
+                "workflow_completed": result_data.get("status") == "completed",
+                "all_stages_executed": result_data.get("completed_stages", 0) >= 6,
+                "quality_threshold_met": result_data.get("overall_quality_score", 0) >= 0.85,
+                "publishing_successful": result_data.get("publishing_result", {}).get("product_page_created", False)
+            }
             
-            if response.status_code == 200:
-                result_data = response.json()
-                
-                # 验证结果
-                validation = {
-                    "workflow_completed": result_data.get("status") == "completed",
-                    "all_stages_executed": result_data.get("completed_stages", 0) >= 6,
-                    "quality_threshold_met": result_data.get("overall_quality_score", 0) >= 0.85,
-                    "publishing_successful": result_data.get("publishing_result", {}).get("product_page_created", False)
-                }
-                
-                return {
-                    "status": "passed" if all(validation.values()) else "failed",
-                    "execution_time": execution_time,
-                    "workflow_result": result_data,
-                    "validation": validation,
-                    "target_url": self.powerauto_website
-                }
-            else:
-                return {
-                    "status": "failed",
-                    "execution_time": execution_time,
-                    "error_message": f"HTTP {response.status_code}: {response.text}",
-                    "target_url": self.powerauto_website
-                }
-                
-        except Exception as e:
             return {
-                "status": "error",
-                "execution_time": time.time() - start_time,
-                "error_message": str(e),
+                "status": "passed" if all(validation.values()) else "failed",
+                "workflow_result": result_data,
+                "validation": validation,
+                "target_url": self.powerauto_website
+            }
+        else:
+            return {
+                "status": "failed",
+                "error_message": f"HTTP {response.status_code}: {response.text}",
                 "target_url": self.powerauto_website
             }
     
+    @timed_test(error_context=lambda self: {"target_url": self.experience_platform})
     async def test_ocr_experience_workflow(self) -> Dict[str, Any]:
         """测试OCR体验工作流"""
         logger.info("测试OCR工作流体验")
         
-        start_time = time.time()
-        
-        try:
-            # 准备OCR测试数据
-            test_data = {
-                "request_id": f"ocr_test_{int(time.time())}",
-                "user_session": "test_session",
-                "workflow_type": "ocr_experience",
-                "input_data": {
-                    "image_data": "base64_encoded_taiwan_insurance_form",
-                    "document_type": "台湾保险表单",
-                    "expected_content": {
-                        "name": "張家銓",
-                        "address": "604 嘉義縣竹崎鄉灣橋村五間厝58-51號",
-                        "amount": "13726元"
-                    },
-                    "version": "enterprise"
+        # 准备OCR测试数据
+        test_data = {
+            "request_id": f"ocr_test_{int(time.time())}",
+            "user_session": "test_session",
+            "workflow_type": "ocr_experience",
+            "input_data": {
+                "image_data": "base64_encoded_taiwan_insurance_form",
+                "document_type": "台湾保险表单",
+                "expected_content": {
+                    "name": "張家銓",
+                    "address": "604 嘉義縣竹崎鄉灣橋村五間厝58-51號",
+                    "amount": "13726元"
                 },
-                "target_environment": self.experience_platform,
-                "quality_requirements": {"min_accuracy": 0.90}
-            }
+                "version": "enterprise"
+            },
+            "target_environment": self.experience_platform,
+            "quality_requirements": {"min_accuracy": 0.90}
+        }
+        
+        # 调用工作流执行API
+        response = await self._post_workflow(json=test_data, timeout=60)
+        
+        if response.status_code == 200:
+            result_data = response.json()
             
-            # 调用工作流执行API
-            response = requests.post(
-                f"{self.coordinator_url}/workflow/execute",
-                json=test_data,
-                timeout=60
-            )
+            # 验证OCR结果
+            ocr_result = result_data.get("ocr_result", {})
+            extracted_text = ocr_result.get("extracted_text", {})
             
-            execution_time = time.time() - start_time
+            validation = {
+                "workflow_completed": result_data.get("status") == "completed",
+                "all_stages_executed": result_data.get("completed_stages", 0) >= 6,
+                "accuracy_threshold_met": result_data.get("overall_quality_score", 0) >= 0.90,
+                "ocr_processing_successful": ocr_result.get("processing_successful", False),
+                "name_extracted": "name" in extracted_text,
+                "address_extracted": "address" in extracted_text,
+                "amount_extracted": "amount" in extracted_text
+            }
             
-            if response.status_code == 200:
-                result_data = response.json()
-                
-                # 验证OCR结果
-                ocr_result = result_data.get("ocr_result", {})
-                extracted_text = ocr_result.get("extracted_text", {})
-                
-                validation = {
-                    "workflow_completed": result_data.get("status") == "completed",
-                    "all_stages_executed": result_data.get("completed_stages", 0) >= 6,
-                    "accuracy_threshold_met": result_data.get("overall_quality_score", 0) >= 0.90,
-                    "ocr_processing_successful": ocr_result.get("processing_successful", False),
-                    "name_extracted": "name" in extracted_text,
-                    "address_extracted": "address" in extracted_text,
-                    "amount_extracted": "amount" in extracted_text
-                }
-                
-                return {
-                    "status": "passed" if all(validation.values()) else "failed",
-                    "execution_time": execution_time,
-                    "workflow_result": result_data,
-                    "ocr_result": ocr_result,
-                    "validation": validation,
-                    "target_url": self.experience_platform
-                }
-            else:
-                return {
-                    "status": "failed",
-                    "execution_time": execution_time,
-                    "error_message": f"HTTP {response.status_code}: {response.text}",
-                    "target_url": self.experience_platform
-                }
-                
-        except Exception as e:
             return {
-                "status": "error",
-                "execution_time": time.time() - start_time,
-                "error_message": str(e),
+                "status": "passed" if all(validation.values()) else "failed",
+                "workflow_result": result_data,
+                "ocr_result": ocr_result,
+                "validation": validation,
+                "target_url": self.experience_platform
+            }
+        else:
+            return {
+                "status": "failed",
+                "error_message": f"HTTP {response.status_code}: {response.text}",
                 "target_url": self.experience_platform
             }
     
@@ -326,38 +360,69 @@ class WorkflowTestValidator:
         
         return performance_results
     
+    def _sample_response_times(self, url: str, samples: int = 5) -> Dict[str, float]:
+        """同步采样响应时间（阻塞调用，由 test_response_time 放到线程中执行）"""
+        # 采样时同步累计次数、总和与最值，无需事后再遍历
+        stats = {"count": 0, "failed": 0, "total": 0.0, "max": 0.0, "min": float("inf")}
+        
+        # 复用同一连接，并先发一次不计时的预热请求，排除建连/首次调用开销
+        with requests.Session() as session:
+            try:
+                session.get(url, timeout=10)
+                warmed_up = True
+            except requests.RequestException as e:
+                # 预热失败说明端点不可达，全部采样计为失败
+                logger.error(f"响应时间测试预热请求失败: {e}")
+                stats["failed"] = samples
+                warmed_up = False
+            
+            if warmed_up:
+                for _ in range(samples):
+                    start_time = time.perf_counter()
+                    try:
+                        response = session.get(url, timeout=10)
+                        if response.status_code == 200:
+                            elapsed = time.perf_counter() - start_time
+                            stats["count"] += 1
+                            stats["total"] += elapsed
+                            stats["max"] = max(stats["max"], elapsed)
+                            stats["min"] = min(stats["min"], elapsed)
+                        else:
+                            stats["failed"] += 1
+                    except requests.ConnectionError:
+                        # 连接失败时后续请求同样会失败，直接结束，避免每次都等待超时
+                        stats["failed"] += samples - stats["count"] - stats["failed"]
+                        break
+                    except requests.RequestException:
+                        stats["failed"] += 1
+        
+        return stats
+    
     async def test_response_time(self) -> Dict[str, Any]:
         """响应时间测试"""
         logger.info("测试响应时间")
         
-        response_times = []
+        stats = await asyncio.to_thread(self._sample_response_times, f"{self.coordinator_url}/health")
+        if stats["failed"]:
+            logger.warning(f"响应时间采样失败 {stats['failed']} 次")
         
-        for i in range(5):
-            start_time = time.time()
-            try:
-                response = requests.get(f"{self.coordinator_url}/health", timeout=10)
-                if response.status_code == 200:
-                    response_times.append(time.time() - start_time)
-            except Exception:
-                pass
-        
-        if response_times:
-            avg_response_time = sum(response_times) / len(response_times)
-            max_response_time = max(response_times)
-            min_response_time = min(response_times)
+        if stats["count"]:
+            avg_response_time = stats["total"] / stats["count"]
             
             return {
                 "status": "passed" if avg_response_time < 1.0 else "failed",
                 "average_response_time": avg_response_time,
-                "max_response_time": max_response_time,
-                "min_response_time": min_response_time,
-                "test_count": len(response_times),
+                "max_response_time": stats["max"],
+                "min_response_time": stats["min"],
+                "test_count": stats["count"],
+                "failed_samples": stats["failed"],
                 "threshold": 1.0
             }
         else:
             return {
                 "status": "failed",
-                "error_message": "无法获取响应时间数据"
+                "error_message": "无法获取响应时间数据",
+                "failed_samples": stats["failed"]
             }
     
     async def test_concurrent_workflows(self) -> Dict[str, Any]:
@@ -369,17 +434,17 @@ class WorkflowTestValidator:
         start_time = time.time()
         
         try:
-            # 发送多个健康检查请求模拟并发
-            tasks = []
-            for i in range(concurrent_count):
-                task = asyncio.create_task(self.async_health_check())
-                tasks.append(task)
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # 发送多个健康检查请求模拟并发，结果到达即计数
+            successful_requests = 0
+            for future in asyncio.as_completed([self.async_health_check() for _ in range(concurrent_count)]):
+                try:
+                    result = await future
+                except Exception:
+                    continue
+                if result.get("success"):
+                    successful_requests += 1
             execution_time = time.time() - start_time
             
-            successful_requests = sum(1 for result in results if isinstance(result, dict) and result.get("success"))
-            
             return {
                 "status": "passed" if successful_requests >= concurrent_count * 0.8 else "failed",
                 "concurrent_requests": concurrent_count,
@@ -398,7 +463,7 @@ class WorkflowTestValidator:
     async def async_health_check(self) -> Dict[str, Any]:
         """异步健康检查"""
         try:
-            response = requests.get(f"{self.coordinator_url}/health", timeout=5)
+            response = await self._http_get(f"{self.coordinator_url}/health", timeout=5)
             return {"success": response.status_code == 200}
         except Exception:
             return {"success": False}
@@ -409,7 +474,7 @@ class WorkflowTestValidator:
         
         # 简化的资源使用测试
         try:
-            response = requests.get(f"{self.coordinator_url}/capabilities", timeout=10)
+            response = await self._http_get(f"{self.coordinator_url}/capabilities", timeout=10)
             if response.status_code == 200:
                 capabilities = response.json()
                 return {
@@ -435,31 +500,27 @@ class WorkflowTestValidator:
         """端到端场景测试"""
         logger.info("执行端到端场景测试")
         
-        scenarios = {
-            "user_journey_test": await self.test_user_journey(),
-            "version_upgrade_test": await self.test_version_upgrade(),
-            "error_handling_test": await self.test_error_handling()
-        }
+        # 各场景互不依赖，并发执行
+        user_journey, version_upgrade, error_handling = await asyncio.gather(
+            self.test_user_journey(),
+            self.test_version_upgrade(),
+            self.test_error_handling()
+        )
         
-        return scenarios
+        return {
+            "user_journey_test": user_journey,
+            "version_upgrade_test": version_upgrade,
+            "error_handling_test": error_handling
+        }
     
     async def test_user_journey(self) -> Dict[str, Any]:
         """用户旅程测试"""
         logger.info("测试用户旅程")
         
         # 模拟用户从官网发现到体验使用的完整流程
-        journey_steps = [
-            "访问PowerAuto.ai官网",
-            "发现OCR Enterprise版产品",
-            "点击体验链接",
-            "上传测试图片",
-            "获得OCR结果",
-            "查看处理报告"
-        ]
-        
         return {
             "status": "passed",
-            "journey_steps": journey_steps,
+            "journey_steps": list(USER_JOURNEY_STEPS),
             "completion_rate": 1.0,
             "user_satisfaction": "高",
             "conversion_potential": "良好"
@@ -493,17 +554,7 @@ class WorkflowTestValidator:
         
         # 测试无效请求的处理
         try:
-            invalid_request = {
-                "request_id": "invalid_test",
-                "workflow_type": "invalid_workflow",
-                "input_data": {}
-            }
-            
-            response = requests.post(
-                f"{self.coordinator_url}/workflow/execute",
-                json=invalid_request,
-                timeout=10
-            )
+            response = await self._post_workflow(json=INVALID_WORKFLOW_REQUEST, timeout=10)
             
             # 期望返回错误状态
             if response.status_code >= 400:
@@ -529,103 +580,81 @@ class WorkflowTestValidator:
     def calculate_overall_status(self, test_results: Dict[str, Any]) -> str:
         """计算总体测试状态"""
         
-        # 收集所有测试状态
-        all_statuses = []
-        
         # 协调器健康状态
-        if test_results["coordinator_health"]["healthy"]:
-            all_statuses.append("passed")
-        else:
-            all_statuses.append("failed")
-        
-        # 版本测试状态
-        for version_result in test_results["version_tests"].values():
-            all_statuses.append(version_result.get("status", "failed"))
-        
-        # 集成测试状态
-        for integration_result in test_results["integration_tests"].values():
-            all_statuses.append(integration_result.get("status", "failed"))
-        
-        # 性能测试状态
-        for perf_result in test_results["performance_tests"].values():
-            all_statuses.append(perf_result.get("status", "failed"))
-        
-        # 端到端测试状态
-        for e2e_result in test_results["end_to_end_tests"].values():
-            all_statuses.append(e2e_result.get("status", "failed"))
-        
-        # 计算总体状态
-        passed_count = all_statuses.count("passed")
-        failed_count = all_statuses.count("failed")
-        error_count = all_statuses.count("error")
-        
-        total_tests = len(all_statuses)
-        success_rate = passed_count / total_tests if total_tests > 0 else 0
-        
-        if success_rate >= 0.9:
-            return "excellent"
-        elif success_rate >= 0.8:
-            return "good"
-        elif success_rate >= 0.6:
-            return "acceptable"
-        else:
-            return "needs_improvement"
+        total_tests = 1
+        passed_count = 1 if test_results["coordinator_health"]["healthy"] else 0
+        
+        # 版本、集成、性能、端到端测试状态：单次遍历计数
+        for group in ("version_tests", "integration_tests", "performance_tests", "end_to_end_tests"):
+            for result in test_results[group].values():
+                total_tests += 1
+                if result.get("status", "failed") == "passed":
+                    passed_count += 1
+        
+        success_rate = passed_count / total_tests
+        
+        return OVERALL_STATUS_LEVELS[bisect.bisect_right(OVERALL_STATUS_THRESHOLDS, success_rate)]
     
     def generate_test_report(self, test_results: Dict[str, Any]) -> str:
         """生成测试报告"""
         
-        report = f"""
+        # 多处引用的子结果先绑定到局部变量
+        overall_status = test_results['overall_status']
+        health = test_results['coordinator_health']
+        integration_tests = test_results['integration_tests']
+        
+        report_parts = [f"""
 # OCR Enterprise版产品工作流测试报告
 
 ## 📊 测试概览
 - **测试会话ID**: {test_results['test_session_id']}
 - **总执行时间**: {test_results['total_time']:.2f}秒
-- **总体状态**: {test_results['overall_status']}
+- **总体状态**: {overall_status}
 
 ## 🏥 协调器健康检查
-- **状态**: {'✅ 健康' if test_results['coordinator_health']['healthy'] else '❌ 异常'}
-- **服务**: {test_results['coordinator_health'].get('service', 'N/A')}
-- **版本**: {test_results['coordinator_health'].get('version', 'N/A')}
+- **状态**: {'✅ 健康' if health['healthy'] else '❌ 异常'}
+- **服务**: {health.get('service', 'N/A')}
+- **版本**: {health.get('version', 'N/A')}
 
 ## 📋 版本配置测试
-"""
+"""]
         
         for version, result in test_results["version_tests"].items():
             status_icon = "✅" if result["status"] == "passed" else "❌"
-            report += f"- **{version.upper()}版**: {status_icon} {result['status']} ({result['agent_count']}个智能体)\n"
+            report_parts.append(f"- **{version.upper()}版**: {status_icon} {result['status']} ({result['agent_count']}个智能体)\n")
         
-        report += f"""
+        report_parts.append("""
 ## 🔄 集成测试结果
-"""
+""")
         
-        for test_name, result in test_results["integration_tests"].items():
+        for test_name, result in integration_tests.items():
             status_icon = "✅" if result["status"] == "passed" else "❌"
-            report += f"- **{test_name}**: {status_icon} {result['status']} ({result['execution_time']:.2f}秒)\n"
+            report_parts.append(f"- **{test_name}**: {status_icon} {result['status']} ({result['execution_time']:.2f}秒)\n")
         
-        report += f"""
+        report_parts.append("""
 ## ⚡ 性能测试结果
-"""
+""")
         
         for test_name, result in test_results["performance_tests"].items():
             status_icon = "✅" if result["status"] == "passed" else "❌"
-            report += f"- **{test_name}**: {status_icon} {result['status']}\n"
+            report_parts.append(f"- **{test_name}**: {status_icon} {result['status']}\n")
         
-        report += f"""
+        report_parts.append("""
 ## 🎯 端到端测试结果
-"""
+""")
         
         for test_name, result in test_results["end_to_end_tests"].items():
             status_icon = "✅" if result["status"] == "passed" else "❌"
-            report += f"- **{test_name}**: {status_icon} {result['status']}\n"
+            report_parts.append(f"- **{test_name}**: {status_icon} {result['status']}\n")
         
-        report += f"""
+        report_parts.append(f"""
 ## 📝 测试结论
 
-基于以上测试结果，OCR Enterprise版产品工作流系统的整体表现为 **{test_results['overall_status']}**。
+基于以上测试结果，OCR Enterprise版产品工作流系统的整体表现为 **{overall_status}**。
 
 ### 核心测试用例验证
-1. **PowerAuto.ai官网发布**: {test_results['integration_tests']['website_publishing']['status']}
-2. **OCR工作流体验**: {test_results['integration_tests']['ocr_experience']['status']}
+1. **PowerAuto.ai官网发布**: {integration_tests['website_publishing']['status']}
+2. **OCR工作流体验**: {integration_tests['ocr_experience']['status']}
 
 ### 建议
 - 系统已准备好进行生产部署
@@ -634,9 +663,9 @@ class WorkflowTestValidator:
 
 ---
 *测试报告生成时间: {time.strftime('%Y-%m-%d %H:%M:%S')}*
-"""
+""")
         
-        return report
+        return "".join(report_parts)
 
 async def main():
     """主测试函数"""
@@ -650,13 +679,14 @@ async def main():
     # 生成测试报告
     report = validator.generate_test_report(test_results)
     
-    # 保存测试结果
-    results_file = f"/home/ubuntu/kilocode_integrated_repo/test_results_{int(time.time())}.json"
+    # 保存测试结果（结果和报告使用同一时间戳命名）
+    run_stamp = int(time.time())
+    results_file = f"/home/ubuntu/kilocode_integrated_repo/test_results_{run_stamp}.json"
     with open(results_file, 'w', encoding='utf-8') as f:
         json.dump(test_results, f, indent=2, ensure_ascii=False)
     
     # 保存测试报告
-    report_file = f"/home/ubuntu/kilocode_integrated_repo/test_report_{int(time.time())}.md"
+    report_file = f"/home/ubuntu/kilocode_integrated_repo/test_report_{run_stamp}.md"
     with open(report_file, 'w', encoding='utf-8') as f:
         f.write(report)
     
@@ -673,5 +703,7 @@ async def main():
     return test_results
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop可选：安装时使用更快的事件循环，否则退回标准asyncio
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop if HAS_UVLOOP else None) as runner:
+        runner.run(main())
 
@@ -8,6 +8,7 @@ Product Orchestrator V3 管理界面 Web 服务器
 from flask import Flask, render_template, request, jsonify, send_from_directory
 from flask_cors import CORS
 import asyncio
+import atexit
 import json
 import logging
 import sys
@@ -15,7 +16,12 @@ import os
 from datetime import datetime
 from pathlib import Path
 import threading
-import time
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # 添加项目路径
 project_root = Path("/opt/powerautomation")
@@ -31,6 +37,109 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)  # 允许跨域请求
 
+# 后台常驻事件循环：各请求复用，避免每次请求创建/销毁事件循环
+# 首次调用 _run 时才启动，进程退出时停止并关闭
+_LOOP = None
+_LOOP_THREAD = None
+_LOOP_LOCK = threading.Lock()
+RUN_TIMEOUT = 60  # 单个协程的最长等待时间（秒）
+
+def _serve_loop(loop):
+    """后台线程：运行事件循环，停止后清理残留任务并关闭"""
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+    finally:
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+def _get_loop():
+    """获取后台事件循环，首次调用时创建并启动"""
+    global _LOOP, _LOOP_THREAD
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            _LOOP_THREAD = threading.Thread(target=_serve_loop, args=(_LOOP,), name="admin-dashboard-loop", daemon=True)
+            _LOOP_THREAD.start()
+        return _LOOP
+
+def _shutdown_loop():
+    """停止后台事件循环并等待其关闭"""
+    global _LOOP, _LOOP_THREAD
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            return
+        _LOOP.call_soon_threadsafe(_LOOP.stop)
+        _LOOP_THREAD.join(timeout=5)
+        _LOOP = None
+        _LOOP_THREAD = None
+
+atexit.register(_shutdown_loop)
+
+def _run(coro, timeout=RUN_TIMEOUT):
+    """在后台事件循环中执行协程并等待结果，超时则取消"""
+    future = asyncio.run_coroutine_threadsafe(coro, _get_loop())
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        raise
+
+def _json_response(payload, status=200):
+    """构造JSON响应，优先使用orjson序列化"""
+    if HAS_ORJSON:
+        # 与Flask默认行为保持一致：键排序、允许非字符串键；
+        # datetime等Flask有自定义格式的类型及orjson不支持的类型回退到jsonify
+        try:
+            body = orjson.dumps(
+                payload,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            )
+        except TypeError:
+            pass
+        else:
+            return app.response_class(body, status=status, mimetype='application/json')
+    response = jsonify(payload)
+    response.status_code = status
+    return response
+
+# 工作流模板（静态配置）
+WORKFLOW_TEMPLATES = {
+    "software_development": {
+        "name": "完整软件开发流程",
+        "description": "包含需求分析到监控运维的完整开发流程",
+        "complexity": "high",
+        "estimated_duration": "2小时",
+        "workflows": ["需求分析", "架构设计", "编码实现", "测试验证", "部署发布", "监控运维"]
+    },
+    "quick_prototype": {
+        "name": "快速原型开发",
+        "description": "快速创建原型的简化流程",
+        "complexity": "low",
+        "estimated_duration": "30分钟",
+        "workflows": ["需求分析", "编码实现", "测试验证"]
+    },
+    "documentation_only": {
+        "name": "文档和设计",
+        "description": "专注于文档和架构设计",
+        "complexity": "medium",
+        "estimated_duration": "20分钟",
+        "workflows": ["需求分析", "架构设计"]
+    },
+    "ai_model_development": {
+        "name": "AI模型开发",
+        "description": "AI模型开发的专用流程",
+        "complexity": "high",
+        "estimated_duration": "1小时",
+        "workflows": ["需求分析", "架构设计", "编码实现", "测试验证", "部署发布"]
+    }
+}
+
 # 全局变量存储orchestrator实例
 orchestrator_instance = None
 active_workflows = {}
@@ -46,7 +155,10 @@ class MockProductOrchestrator:
     async def create_and_execute_workflow(self, requirements):
         """创建并执行工作流"""
         self.workflow_counter += 1
-        workflow_id = f"workflow_{self.workflow_counter}_{int(time.time())}"
+        # 同一请求内的ID与时间戳共用一次时钟读取
+        now = datetime.now()
+        timestamp = now.isoformat()
+        workflow_id = f"workflow_{self.workflow_counter}_{int(now.timestamp())}"
         
         # 模拟工作流执行
         workflow_data = {
@@ -56,8 +168,8 @@ class MockProductOrchestrator:
             "complexity": requirements.get("complexity", "medium"),
             "status": "completed",
             "progress": 1.0,
-            "created_at": datetime.now().isoformat(),
-            "completed_at": datetime.now().isoformat(),
+            "created_at": timestamp,
+            "completed_at": timestamp,
             "execution_result": {
                 "success": True,
                 "generated_files": [
@@ -113,19 +225,16 @@ def index():
 def get_workflows():
     """获取所有工作流"""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        workflows = loop.run_until_complete(orchestrator_instance.list_active_workflows())
-        loop.close()
+        workflows = _run(orchestrator_instance.list_active_workflows())
         
-        return jsonify({
+        return _json_response({
             "success": True,
             "workflows": workflows,
             "total": len(workflows)
         })
     except Exception as e:
         logger.error(f"Error getting workflows: {e}")
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json_response({"success": False, "error": str(e)}, 500)
 
 @app.route('/api/workflows', methods=['POST'])
 def create_workflow():
@@ -135,7 +244,7 @@ def create_workflow():
         
         # 验证必需字段
         if not data.get('name'):
-            return jsonify({"success": False, "error": "Name is required"}), 400
+            return _json_response({"success": False, "error": "Name is required"}, 400)
         
         # 设置默认值
         requirements = {
@@ -148,100 +257,62 @@ def create_workflow():
         }
         
         # 执行工作流
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(orchestrator_instance.create_and_execute_workflow(requirements))
-        loop.close()
+        result = _run(orchestrator_instance.create_and_execute_workflow(requirements))
         
         # 添加到历史记录
         workflow_history.append(result)
         
-        return jsonify({
+        return _json_response({
             "success": True,
             "workflow": result
         })
         
     except Exception as e:
         logger.error(f"Error creating workflow: {e}")
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json_response({"success": False, "error": str(e)}, 500)
 
 @app.route('/api/workflows/<workflow_id>', methods=['GET'])
 def get_workflow_status(workflow_id):
     """获取特定工作流状态"""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        status = loop.run_until_complete(orchestrator_instance.get_workflow_status(workflow_id))
-        loop.close()
+        status = _run(orchestrator_instance.get_workflow_status(workflow_id))
         
-        return jsonify({
+        return _json_response({
             "success": True,
             "workflow": status
         })
     except Exception as e:
         logger.error(f"Error getting workflow status: {e}")
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json_response({"success": False, "error": str(e)}, 500)
 
 @app.route('/api/templates', methods=['GET'])
 def get_workflow_templates():
     """获取工作流模板"""
-    templates = {
-        "software_development": {
-            "name": "完整软件开发流程",
-            "description": "包含需求分析到监控运维的完整开发流程",
-            "complexity": "high",
-            "estimated_duration": "2小时",
-            "workflows": ["需求分析", "架构设计", "编码实现", "测试验证", "部署发布", "监控运维"]
-        },
-        "quick_prototype": {
-            "name": "快速原型开发",
-            "description": "快速创建原型的简化流程",
-            "complexity": "low",
-            "estimated_duration": "30分钟",
-            "workflows": ["需求分析", "编码实现", "测试验证"]
-        },
-        "documentation_only": {
-            "name": "文档和设计",
-            "description": "专注于文档和架构设计",
-            "complexity": "medium",
-            "estimated_duration": "20分钟",
-            "workflows": ["需求分析", "架构设计"]
-        },
-        "ai_model_development": {
-            "name": "AI模型开发",
-            "description": "AI模型开发的专用流程",
-            "complexity": "high",
-            "estimated_duration": "1小时",
-            "workflows": ["需求分析", "架构设计", "编码实现", "测试验证", "部署发布"]
-        }
-    }
-    
-    return jsonify({
+    return _json_response({
         "success": True,
-        "templates": templates
+        "templates": WORKFLOW_TEMPLATES
     })
 
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """获取统计信息"""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        workflows = loop.run_until_complete(orchestrator_instance.list_active_workflows())
-        loop.close()
+        workflows = _run(orchestrator_instance.list_active_workflows())
         
-        # 计算统计信息
+        # 单次遍历统计状态计数与复杂度分布
         total_workflows = len(workflows)
-        completed_workflows = len([w for w in workflows if w.get('status') == 'completed'])
-        failed_workflows = len([w for w in workflows if w.get('status') == 'failed'])
-        running_workflows = len([w for w in workflows if w.get('status') == 'running'])
-        
-        # 复杂度分布
+        status_counts = {}
         complexity_stats = {}
         for workflow in workflows:
+            status = workflow.get('status')
+            status_counts[status] = status_counts.get(status, 0) + 1
             complexity = workflow.get('complexity', 'unknown')
             complexity_stats[complexity] = complexity_stats.get(complexity, 0) + 1
         
+        completed_workflows = status_counts.get('completed', 0)
+        failed_workflows = status_counts.get('failed', 0)
+        running_workflows = status_counts.get('running', 0)
+        
         # 平均执行时间（模拟数据）
         avg_execution_time = 15.5  # 秒
         
@@ -256,19 +327,19 @@ def get_stats():
             "last_updated": datetime.now().isoformat()
         }
         
-        return jsonify({
+        return _json_response({
             "success": True,
             "stats": stats
         })
         
     except Exception as e:
         logger.error(f"Error getting stats: {e}")
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json_response({"success": False, "error": str(e)}, 500)
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """健康检查"""
-    return jsonify({
+    return _json_response({
         "status": "healthy",
         "service": "Product Orchestrator V3 Admin Dashboard",
         "version": "3.0.0",
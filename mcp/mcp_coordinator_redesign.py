@@ -16,13 +16,43 @@ import asyncio
 import json
 import time
 import hashlib
+import re
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Union, Deque
+from collections import deque
+from dataclasses import dataclass, asdict, is_dataclass
 from enum import Enum
 import logging
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def _json_default(obj: Any) -> Any:
+    """JSON序列化兜底：枚举取值，其余转字符串"""
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+def _dump_json(obj: Any, file_path: Path):
+    """写入JSON文件，优先使用orjson"""
+    if HAS_ORJSON:
+        # orjson原生支持dataclass/Enum/datetime，无需asdict深拷贝
+        file_path.write_bytes(orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=_json_default
+        ))
+        return
+    
+    if is_dataclass(obj):
+        obj = asdict(obj)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False, default=_json_default)
+
 # ============================================================================
 # 1. 核心数据结构定义
 # ============================================================================
@@ -47,7 +77,7 @@ class ProcessingLocation(Enum):
     CLOUD_ONLY = "cloud_only"
     HYBRID = "hybrid"
 
-@dataclass
+@dataclass(slots=True)
 class InteractionRecord:
     """交互记录数据结构"""
     id: str
@@ -63,7 +93,7 @@ class InteractionRecord:
     context: Dict[str, Any]
     tags: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class MCPPerformanceMetrics:
     """MCP性能指标"""
     mcp_type: MCPType
@@ -75,7 +105,7 @@ class MCPPerformanceMetrics:
     quality_score: float
     last_updated: str
 
-@dataclass
+@dataclass(slots=True)
 class RoutingDecisionRecord:
     """路由决策记录"""
     decision_id: str
@@ -99,14 +129,31 @@ class InteractionDataManager:
     统一管理所有MCP的交互数据，提供数据存储、查询、分析功能
     """
     
-    def __init__(self, base_dir: str = "/home/ubuntu/powerautomation/interaction_data"):
+    def __init__(self, 
+                 base_dir: str = "/home/ubuntu/powerautomation/interaction_data",
+                 max_memory_records: int = 10000):
         self.base_dir = Path(base_dir)
         self.setup_directory_structure()
-        self.interaction_records: List[InteractionRecord] = []
-        self.routing_decisions: List[RoutingDecisionRecord] = []
+        # 内存中只保留最近的记录（完整数据已持久化到磁盘），超出上限时O(1)淘汰最旧记录
+        self.interaction_records: Deque[InteractionRecord] = deque(maxlen=max_memory_records)
+        self.routing_decisions: Deque[RoutingDecisionRecord] = deque(maxlen=max_memory_records)
         self.mcp_metrics: Dict[MCPType, MCPPerformanceMetrics] = {}
         self.logger = logging.getLogger("InteractionDataManager")
         
+        # 路由决策的增量统计，避免每次分析都遍历全部决策记录
+        self._routing_stats: Dict[str, Any] = {
+            "total_decisions": 0,
+            "mcp_selection_count": {},
+            "location_count": {},
+            "confidence_sum": 0.0,
+            "confidence_min": None,
+            "confidence_max": None
+        }
+        
+        # 交互模式的增量统计（与内存中的交互记录保持一致）
+        self._hourly_distribution: Dict[int, int] = {}
+        self._interaction_type_distribution: Dict[str, int] = {}
+        
         # 初始化MCP性能指标
         self._initialize_mcp_metrics()
     
@@ -129,6 +176,7 @@ class InteractionDataManager:
     
     def _initialize_mcp_metrics(self):
         """初始化MCP性能指标"""
+        now_iso = datetime.now().isoformat()
         for mcp_type in MCPType:
             self.mcp_metrics[mcp_type] = MCPPerformanceMetrics(
                 mcp_type=mcp_type,
@@ -138,7 +186,7 @@ class InteractionDataManager:
                 average_response_time=0.0,
                 average_cost=0.0,
                 quality_score=0.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now_iso
             )
     
     def record_interaction(self, 
@@ -171,14 +219,17 @@ class InteractionDataManager:
             交互记录ID
         """
         
+        # 同一次记录共用一个时间点
+        now = datetime.now()
+        
         # 生成交互记录ID
-        interaction_id = self._generate_interaction_id(session_id, mcp_type)
+        interaction_id = self._generate_interaction_id(session_id, mcp_type, now)
         
         # 创建交互记录
         record = InteractionRecord(
             id=interaction_id,
             session_id=session_id,
-            timestamp=datetime.now().isoformat(),
+            timestamp=now.isoformat(),
             interaction_type=interaction_type,
             mcp_type=mcp_type,
             user_request=user_request,
@@ -190,11 +241,16 @@ class InteractionDataManager:
             tags=tags or []
         )
         
-        # 存储记录
-        self.interaction_records.append(record)
+        # 存储记录（内存已满时先扣除即将被淘汰记录的模式统计）
+        records = self.interaction_records
+        if records.maxlen is not None and len(records) == records.maxlen:
+            evicted = records[0]
+            self._update_interaction_patterns(evicted, datetime.fromisoformat(evicted.timestamp).hour, -1)
+        records.append(record)
+        self._update_interaction_patterns(record, now.hour, 1)
         
         # 更新MCP性能指标
-        self._update_mcp_metrics(mcp_type, performance_metrics)
+        self._update_mcp_metrics(mcp_type, performance_metrics, now)
         
         # 持久化存储
         self._save_interaction_record(record)
@@ -227,11 +283,12 @@ class InteractionDataManager:
             决策记录ID
         """
         
-        decision_id = self._generate_decision_id()
+        now = datetime.now()
+        decision_id = self._generate_decision_id(now)
         
         decision_record = RoutingDecisionRecord(
             decision_id=decision_id,
-            timestamp=datetime.now().isoformat(),
+            timestamp=now.isoformat(),
             user_request=user_request,
             selected_mcp=selected_mcp,
             processing_location=processing_location,
@@ -242,26 +299,31 @@ class InteractionDataManager:
         )
         
         self.routing_decisions.append(decision_record)
+        self._update_routing_stats(decision_record)
         self._save_routing_decision(decision_record)
         
         self.logger.info(f"记录路由决策: {decision_id} -> {selected_mcp.value}")
         
         return decision_id
     
-    def _generate_interaction_id(self, session_id: str, mcp_type: MCPType) -> str:
+    def _generate_interaction_id(self, session_id: str, mcp_type: MCPType,
+                                 now: Optional[datetime] = None) -> str:
         """生成交互记录ID"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        hash_input = f"{session_id}_{mcp_type.value}_{time.time()}"
+        now = now or datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        hash_input = f"{session_id}_{mcp_type.value}_{now.timestamp()}"
         hash_suffix = hashlib.md5(hash_input.encode()).hexdigest()[:8]
         return f"int_{timestamp}_{hash_suffix}"
     
-    def _generate_decision_id(self) -> str:
+    def _generate_decision_id(self, now: Optional[datetime] = None) -> str:
         """生成决策记录ID"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        hash_suffix = hashlib.md5(str(time.time()).encode()).hexdigest()[:8]
+        now = now or datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        hash_suffix = hashlib.md5(str(now.timestamp()).encode()).hexdigest()[:8]
         return f"dec_{timestamp}_{hash_suffix}"
     
-    def _update_mcp_metrics(self, mcp_type: MCPType, performance_metrics: Dict[str, Any]):
+    def _update_mcp_metrics(self, mcp_type: MCPType, performance_metrics: Dict[str, Any],
+                            now: Optional[datetime] = None):
         """更新MCP性能指标"""
         
         metrics = self.mcp_metrics[mcp_type]
@@ -293,7 +355,35 @@ class InteractionDataManager:
             total_quality = metrics.quality_score * (metrics.successful_requests - 1) + quality
             metrics.quality_score = total_quality / max(1, metrics.successful_requests)
         
-        metrics.last_updated = datetime.now().isoformat()
+        metrics.last_updated = (now or datetime.now()).isoformat()
+    
+    def _update_interaction_patterns(self, record: InteractionRecord, hour: int, delta: int):
+        """增量更新交互模式统计"""
+        
+        for distribution, key in ((self._hourly_distribution, hour),
+                                  (self._interaction_type_distribution, record.interaction_type.value)):
+            count = distribution.get(key, 0) + delta
+            if count > 0:
+                distribution[key] = count
+            else:
+                distribution.pop(key, None)
+    
+    def _update_routing_stats(self, decision: RoutingDecisionRecord):
+        """增量更新路由统计"""
+        
+        stats = self._routing_stats
+        stats["total_decisions"] += 1
+        mcp_count = stats["mcp_selection_count"]
+        location_count = stats["location_count"]
+        mcp_count[decision.selected_mcp] = mcp_count.get(decision.selected_mcp, 0) + 1
+        location_count[decision.processing_location] = location_count.get(decision.processing_location, 0) + 1
+        
+        confidence = decision.confidence
+        stats["confidence_sum"] += confidence
+        if stats["confidence_min"] is None or confidence < stats["confidence_min"]:
+            stats["confidence_min"] = confidence
+        if stats["confidence_max"] is None or confidence > stats["confidence_max"]:
+            stats["confidence_max"] = confidence
     
     def _save_interaction_record(self, record: InteractionRecord):
         """保存交互记录到文件"""
@@ -306,17 +396,13 @@ class InteractionDataManager:
         }.get(record.interaction_type, "general")
         
         file_path = self.base_dir / "interactions" / type_dir / f"{record.id}.json"
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(asdict(record), f, indent=2, ensure_ascii=False, default=str)
+        _dump_json(record, file_path)
     
     def _save_routing_decision(self, decision: RoutingDecisionRecord):
         """保存路由决策到文件"""
         
         file_path = self.base_dir / "routing" / "decisions" / f"{decision.decision_id}.json"
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(asdict(decision), f, indent=2, ensure_ascii=False, default=str)
+        _dump_json(decision, file_path)
     
     def get_mcp_performance(self, mcp_type: MCPType = None) -> Union[MCPPerformanceMetrics, Dict[MCPType, MCPPerformanceMetrics]]:
         """获取MCP性能指标"""
@@ -333,49 +419,34 @@ class InteractionDataManager:
                                limit: int = 100) -> List[InteractionRecord]:
         """获取交互历史"""
         
-        filtered_records = self.interaction_records
-        
-        if session_id:
-            filtered_records = [r for r in filtered_records if r.session_id == session_id]
-        
-        if mcp_type:
-            filtered_records = [r for r in filtered_records if r.mcp_type == mcp_type]
-        
-        if interaction_type:
-            filtered_records = [r for r in filtered_records if r.interaction_type == interaction_type]
+        # 单次遍历同时应用全部过滤条件
+        filtered_records = [
+            r for r in self.interaction_records
+            if (not session_id or r.session_id == session_id)
+            and (not mcp_type or r.mcp_type == mcp_type)
+            and (not interaction_type or r.interaction_type == interaction_type)
+        ]
         
         # 按时间倒序排列，返回最新的记录
-        filtered_records.sort(key=lambda x: x.timestamp, reverse=True)
-        
-        return filtered_records[:limit]
+        return sorted(filtered_records, key=lambda x: x.timestamp, reverse=True)[:limit]
     
     def get_routing_analytics(self) -> Dict[str, Any]:
         """获取路由分析数据"""
         
-        if not self.routing_decisions:
+        # 直接读取增量维护的统计结果（覆盖全部决策，不受内存记录上限影响）
+        stats = self._routing_stats
+        total_decisions = stats["total_decisions"]
+        if not total_decisions:
             return {"total_decisions": 0}
         
-        # 统计各MCP的选择次数
-        mcp_selection_count = {}
-        location_count = {}
-        confidence_scores = []
-        
-        for decision in self.routing_decisions:
-            mcp_type = decision.selected_mcp
-            location = decision.processing_location
-            
-            mcp_selection_count[mcp_type] = mcp_selection_count.get(mcp_type, 0) + 1
-            location_count[location] = location_count.get(location, 0) + 1
-            confidence_scores.append(decision.confidence)
-        
         return {
-            "total_decisions": len(self.routing_decisions),
-            "mcp_selection_distribution": {k.value: v for k, v in mcp_selection_count.items()},
-            "location_distribution": {k.value: v for k, v in location_count.items()},
-            "average_confidence": sum(confidence_scores) / len(confidence_scores),
+            "total_decisions": total_decisions,
+            "mcp_selection_distribution": {k.value: v for k, v in stats["mcp_selection_count"].items()},
+            "location_distribution": {k.value: v for k, v in stats["location_count"].items()},
+            "average_confidence": stats["confidence_sum"] / total_decisions,
             "confidence_range": {
-                "min": min(confidence_scores),
-                "max": max(confidence_scores)
+                "min": stats["confidence_min"],
+                "max": stats["confidence_max"]
             }
         }
     
@@ -385,8 +456,9 @@ class InteractionDataManager:
         report = {
             "timestamp": datetime.now().isoformat(),
             "summary": {
-                "total_interactions": len(self.interaction_records),
-                "total_routing_decisions": len(self.routing_decisions)
+                # 内存记录有上限，总数取自累计统计
+                "total_interactions": sum(m.total_requests for m in self.mcp_metrics.values()),
+                "total_routing_decisions": self._routing_stats["total_decisions"]
             },
             "mcp_performance": {k.value: asdict(v) for k, v in self.mcp_metrics.items()},
             "routing_analytics": self.get_routing_analytics(),
@@ -395,9 +467,7 @@ class InteractionDataManager:
         
         # 保存报告
         report_path = self.base_dir / "exports" / "reports" / f"analytics_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+        _dump_json(report, report_path)
         
         return report
     
@@ -407,18 +477,9 @@ class InteractionDataManager:
         if not self.interaction_records:
             return {}
         
-        # 按小时统计交互量
-        hourly_distribution = {}
-        interaction_type_distribution = {}
-        
-        for record in self.interaction_records:
-            # 提取小时
-            hour = datetime.fromisoformat(record.timestamp).hour
-            hourly_distribution[hour] = hourly_distribution.get(hour, 0) + 1
-            
-            # 统计交互类型
-            int_type = record.interaction_type.value
-            interaction_type_distribution[int_type] = interaction_type_distribution.get(int_type, 0) + 1
+        # 按小时和交互类型的分布在记录时已增量维护
+        hourly_distribution = dict(self._hourly_distribution)
+        interaction_type_distribution = dict(self._interaction_type_distribution)
         
         return {
             "hourly_distribution": hourly_distribution,
@@ -430,6 +491,12 @@ class InteractionDataManager:
 # 3. MCPCoordinator重新设计
 # ============================================================================
 
+# 路由关键词规则（按优先级排列，模式预编译）：(关键词模式, 目标MCP, 处理位置)
+ROUTING_RULES = (
+    (re.compile(r"ocr|图像", re.IGNORECASE), MCPType.CLOUD_SEARCH, ProcessingLocation.CLOUD_ONLY),
+    (re.compile(r"本地|local", re.IGNORECASE), MCPType.LOCAL_MODEL, ProcessingLocation.LOCAL_ONLY),
+)
+
 class MCPCoordinator:
     """
     MCP协调器
@@ -439,7 +506,9 @@ class MCPCoordinator:
     
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or self._get_default_config()
-        self.interaction_manager = InteractionDataManager()
+        self.interaction_manager = InteractionDataManager(
+            max_memory_records=self.config.get("data_management", {}).get("max_memory_records", 10000)
+        )
         self.registered_mcps: Dict[MCPType, Any] = {}
         self.current_session_id = self._generate_session_id()
         self.logger = logging.getLogger("MCPCoordinator")
@@ -497,14 +566,14 @@ class MCPCoordinator:
             处理结果
         """
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # 1. 智慧路由决策
-            routing_result = await self._make_routing_decision(user_request, request_type, context)
+            routing_result = self._make_routing_decision(user_request, request_type, context)
             
             # 2. 执行MCP处理
-            mcp_result = await self._execute_mcp_request(
+            mcp_result = self._execute_mcp_request(
                 routing_result["selected_mcp"],
                 user_request,
                 routing_result["processing_location"],
@@ -512,6 +581,7 @@ class MCPCoordinator:
             )
             
             # 3. 记录交互数据
+            processing_time = time.perf_counter() - start_time
             interaction_id = self.interaction_manager.record_interaction(
                 session_id=self.current_session_id,
                 interaction_type=self._classify_interaction_type(request_type),
@@ -520,7 +590,7 @@ class MCPCoordinator:
                 mcp_response=mcp_result.get("response", ""),
                 processing_location=routing_result["processing_location"],
                 performance_metrics={
-                    "response_time": time.time() - start_time,
+                    "response_time": processing_time,
                     "success": mcp_result.get("success", False),
                     "cost": mcp_result.get("cost", 0.0),
                     "quality_score": mcp_result.get("quality_score", 0.0)
@@ -544,11 +614,12 @@ class MCPCoordinator:
                 "interaction_id": interaction_id,
                 "result": mcp_result,
                 "routing_info": routing_result,
-                "processing_time": time.time() - start_time
+                "processing_time": processing_time
             }
             
         except Exception as e:
             self.logger.error(f"请求处理失败: {e}")
+            processing_time = time.perf_counter() - start_time
             
             # 记录失败的交互
             self.interaction_manager.record_interaction(
@@ -559,7 +630,7 @@ class MCPCoordinator:
                 mcp_response=f"错误: {str(e)}",
                 processing_location=ProcessingLocation.LOCAL_ONLY,
                 performance_metrics={
-                    "response_time": time.time() - start_time,
+                    "response_time": processing_time,
                     "success": False,
                     "error": str(e)
                 },
@@ -569,25 +640,22 @@ class MCPCoordinator:
             return {
                 "success": False,
                 "error": str(e),
-                "processing_time": time.time() - start_time
+                "processing_time": processing_time
             }
     
-    async def _make_routing_decision(self, 
-                                   user_request: str,
-                                   request_type: str,
-                                   context: Dict[str, Any]) -> Dict[str, Any]:
+    def _make_routing_decision(self, 
+                             user_request: str,
+                             request_type: str,
+                             context: Dict[str, Any]) -> Dict[str, Any]:
         """智慧路由决策"""
         
         # 基于历史数据和当前请求特征进行路由决策
         # 这里可以集成之前设计的智慧路由算法
         
-        # 简化的决策逻辑（实际应该更复杂）
-        if "ocr" in user_request.lower() or "图像" in user_request:
-            selected_mcp = MCPType.CLOUD_SEARCH
-            processing_location = ProcessingLocation.CLOUD_ONLY
-        elif "本地" in user_request or "local" in user_request.lower():
-            selected_mcp = MCPType.LOCAL_MODEL
-            processing_location = ProcessingLocation.LOCAL_ONLY
+        # 简化的决策逻辑（实际应该更复杂）：按优先级匹配关键词规则
+        for pattern, selected_mcp, processing_location in ROUTING_RULES:
+            if pattern.search(user_request):
+                break
         else:
             selected_mcp = MCPType.CLOUD_EDGE_DATA
             processing_location = ProcessingLocation.HYBRID
@@ -603,11 +671,11 @@ class MCPCoordinator:
             }
         }
     
-    async def _execute_mcp_request(self,
-                                 mcp_type: MCPType,
-                                 user_request: str,
-                                 processing_location: ProcessingLocation,
-                                 context: Dict[str, Any]) -> Dict[str, Any]:
+    def _execute_mcp_request(self,
+                           mcp_type: MCPType,
+                           user_request: str,
+                           processing_location: ProcessingLocation,
+                           context: Dict[str, Any]) -> Dict[str, Any]:
         """执行MCP请求"""
         
         if mcp_type not in self.registered_mcps:
@@ -28,6 +28,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 默认测试阶段
+DEFAULT_TEST_PHASES = ('unit', 'integration', 'functional')
+
+# 测试阶段之间的依赖关系（未列出的阶段只依赖环境准备，可并行执行）
+TEST_PHASE_DEPENDENCIES = {
+    'functional': ('integration',),
+    'ui': ('integration',),
+    'performance': ('integration', 'functional', 'ui'),
+}
+
+# AI策略的通用建议（每个策略返回独立的列表副本）
+AI_STRATEGY_RECOMMENDATIONS = (
+    "优先测试核心业务逻辑",
+    "增加边界条件测试",
+    "关注性能瓶颈点"
+)
+
 
 class WorkflowStatus(Enum):
     """工作流状态枚举"""
@@ -55,7 +72,7 @@ class Priority(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+@dataclass(slots=True)
 class TestStrategy:
     """测试策略数据模型"""
     id: str
@@ -78,7 +95,7 @@ class TestStrategy:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowStep:
     """工作流步骤数据模型"""
     id: str
@@ -94,7 +111,7 @@ class WorkflowStep:
             self.dependencies = []
 
 
-@dataclass
+@dataclass(slots=True)
 class TestWorkflow:
     """测试工作流数据模型"""
     id: str
@@ -121,7 +138,7 @@ class TestWorkflow:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowResult:
     """工作流结果数据模型"""
     workflow_id: str
@@ -257,13 +274,15 @@ class TestWorkflowManager:
             project_context, requirements or {}
         )
         
+        # 名称默认值与创建时间共用同一次时钟读取
+        created_at = datetime.now()
         strategy = TestStrategy(
             id=strategy_id,
-            name=strategy_params.get('name', f"AI策略_{datetime.now().strftime('%Y%m%d_%H%M%S')}"),
+            name=strategy_params.get('name', f"AI策略_{created_at:%Y%m%d_%H%M%S}"),
             strategy_type=StrategyType.INTELLIGENT,
             description=strategy_params.get('description', 'AI生成的智能测试策略'),
             parameters=strategy_params,
-            created_at=datetime.now()
+            created_at=created_at
         )
         
         self.strategies[strategy_id] = strategy
@@ -291,16 +310,17 @@ class TestWorkflowManager:
         strategy = self.strategies[strategy_id]
         
         # 根据策略生成工作流步骤
-        steps = await self._generate_workflow_steps(strategy, workflow_config)
+        steps = self._generate_workflow_steps(strategy, workflow_config)
         
+        created_at = datetime.now()
         workflow = TestWorkflow(
             id=workflow_id,
-            name=workflow_config.get('name', f"工作流_{datetime.now().strftime('%Y%m%d_%H%M%S')}"),
+            name=workflow_config.get('name', f"工作流_{created_at:%Y%m%d_%H%M%S}"),
             description=workflow_config.get('description', '基于AI策略的测试工作流'),
             strategy_id=strategy_id,
             steps=steps,
             status=WorkflowStatus.PENDING,
-            created_at=datetime.now()
+            created_at=created_at
         )
         
         self.workflows[workflow_id] = workflow
@@ -308,9 +328,9 @@ class TestWorkflowManager:
         
         return workflow_id
     
-    async def _generate_workflow_steps(self, 
-                                     strategy: TestStrategy, 
-                                     config: Dict[str, Any]) -> List[WorkflowStep]:
+    def _generate_workflow_steps(self, 
+                               strategy: TestStrategy, 
+                               config: Dict[str, Any]) -> List[WorkflowStep]:
         """根据策略生成工作流步骤"""
         steps = []
         
@@ -326,11 +346,16 @@ class TestWorkflowManager:
         ))
         
         # 测试执行步骤
-        test_phases = strategy.parameters.get('test_phases', ['unit', 'integration', 'functional'])
+        test_phases = strategy.parameters.get('test_phases', DEFAULT_TEST_PHASES)
         
-        for i, phase in enumerate(test_phases):
+        for phase in test_phases:
             step_id = f"step_test_{phase}"
-            dependencies = [steps[-1].id] if steps else []
+            # 依赖环境准备及本策略中存在的前置阶段
+            dependencies = ["step_env_setup"] + [
+                f"step_test_{required}"
+                for required in TEST_PHASE_DEPENDENCIES.get(phase, ())
+                if required in test_phases
+            ]
             
             steps.append(WorkflowStep(
                 id=step_id,
@@ -506,15 +531,11 @@ class AIStrategyGenerator:
         strategy = {
             'name': f"AI智能策略_{project_type}",
             'description': f"基于{project_type}项目的AI生成测试策略",
-            'test_phases': ['unit', 'integration', 'functional'],
+            'test_phases': list(DEFAULT_TEST_PHASES),
             'coverage_target': 85 if complexity == 'high' else 80,
             'parallel_execution': True,
             'optimization_enabled': True,
-            'ai_recommendations': [
-                "优先测试核心业务逻辑",
-                "增加边界条件测试",
-                "关注性能瓶颈点"
-            ]
+            'ai_recommendations': list(AI_STRATEGY_RECOMMENDATIONS)
         }
         
         # 根据需求调整策略
@@ -543,24 +564,40 @@ class WorkflowEngine:
             'step_results': {}
         }
         
-        # 按依赖关系执行步骤
+        # 按依赖关系分批执行：依赖均已完成的步骤为一批，批内并发执行
         executed_steps = set()
+        pending_steps = list(workflow.steps)
         
-        for step in workflow.steps:
-            # 检查依赖
-            if all(dep in executed_steps for dep in step.dependencies):
-                try:
-                    step_result = await self._execute_step(step, adapters)
-                    results['step_results'][step.id] = step_result
+        while pending_steps:
+            ready_steps = [
+                step for step in pending_steps
+                if all(dep in executed_steps for dep in step.dependencies)
+            ]
+            if not ready_steps:
+                # 剩余步骤的依赖失败或无法满足
+                break
+            
+            ready_ids = {step.id for step in ready_steps}
+            pending_steps = [step for step in pending_steps if step.id not in ready_ids]
+            
+            step_outcomes = await asyncio.gather(
+                *(self._execute_step(step, adapters) for step in ready_steps),
+                return_exceptions=True
+            )
+            
+            for step, outcome in zip(ready_steps, step_outcomes):
+                if isinstance(outcome, Exception):
+                    results['failed_steps'] += 1
+                    results['step_results'][step.id] = {'error': str(outcome)}
+                    logger.error(f"工作流步骤执行失败: {step.id}, 错误: {outcome}")
+                elif isinstance(outcome, BaseException):
+                    raise outcome
+                else:
+                    results['step_results'][step.id] = outcome
                     results['completed_steps'] += 1
                     executed_steps.add(step.id)
                     
                     logger.info(f"工作流步骤执行成功: {step.id}")
-                    
-                except Exception as e:
-                    results['failed_steps'] += 1
-                    results['step_results'][step.id] = {'error': str(e)}
-                    logger.error(f"工作流步骤执行失败: {step.id}, 错误: {e}")
         
         return results
     